@@ -2,11 +2,19 @@ import streamlit as st
 import google.generativeai as genai
 import json
 import time
+import sys
+import argparse
+import base64
+import gzip
+import io
+import numpy as np
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 import sqlite3
 import hashlib
+import re
+from collections import Counter
 from datetime import datetime
 import matplotlib.pyplot as plt
 from openai import OpenAI
@@ -23,6 +31,12 @@ try:
 except ImportError:
     pytesseract = None
 
+# zstandard aussi (bundles .zst)
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # --- 1. CONFIGURATION ---
 st.set_page_config(page_title="Gemini/GPT Exam Platform", page_icon="🎓", layout="wide")
 
@@ -53,9 +67,29 @@ def init_db():
     c.execute("""CREATE TABLE IF NOT EXISTS users (username TEXT PRIMARY KEY, password TEXT, created_at TEXT)""")
     c.execute("""CREATE TABLE IF NOT EXISTS history (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT, course_name TEXT, score REAL, total_questions INTEGER, date TEXT, details_json TEXT)""")
     c.execute("""CREATE TABLE IF NOT EXISTS public_exams (id INTEGER PRIMARY KEY AUTOINCREMENT, author TEXT, title TEXT, questions_json TEXT, created_at TEXT)""")
+
+    # Empreinte du contenu, utilisée pour dédoublonner les imports
+    cols = [row[1] for row in c.execute("PRAGMA table_info(public_exams)")]
+    if "content_hash" not in cols:
+        c.execute("ALTER TABLE public_exams ADD COLUMN content_hash TEXT")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_public_exams_hash ON public_exams (content_hash)")
+    rows = c.execute("SELECT id, questions_json FROM public_exams WHERE content_hash IS NULL").fetchall()
+    updates = []
+    for exam_id, questions_json in rows:
+        try:
+            updates.append((exam_content_hash(json.loads(questions_json)), exam_id))
+        except (TypeError, ValueError):
+            # Ligne illisible : on la laisse sans empreinte plutôt que de bloquer le démarrage
+            continue
+    if updates:
+        c.executemany("UPDATE public_exams SET content_hash = ? WHERE id = ?", updates)
     conn.commit()
     conn.close()
 
+def exam_content_hash(questions) -> str:
+    canonical = json.dumps(questions, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
 def hash_password(password: str) -> str:
     return hashlib.sha256(str.encode(password)).hexdigest()
 
@@ -117,13 +151,169 @@ def get_public_exams():
 def publish_exam(author, title, questions):
     conn = sqlite3.connect('quiz_database.db')
     conn.execute(
-        "INSERT INTO public_exams (author, title, questions_json, created_at) "
-        "VALUES (?, ?, ?, ?)",
-        (author, title, json.dumps(questions), str(datetime.now())[:16])
+        "INSERT INTO public_exams (author, title, questions_json, created_at, content_hash) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (author, title, json.dumps(questions), str(datetime.now())[:16], exam_content_hash(questions))
     )
     conn.commit()
     conn.close()
 
+def get_existing_usernames(usernames) -> set:
+    """Renvoie le sous-ensemble de `usernames` qui correspond à des comptes existants."""
+    wanted = set(usernames)
+    conn = sqlite3.connect('quiz_database.db')
+    try:
+        return {u for (u,) in conn.execute("SELECT username FROM users") if u in wanted}
+    finally:
+        conn.close()
+
+def save_results_bulk(course_name, results):
+    """
+    Enregistre en une seule transaction une liste de résultats
+    (username, score, total, details) dans l'historique.
+    """
+    date = str(datetime.now())[:16]
+    conn = sqlite3.connect('quiz_database.db')
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO history (username, course_name, score, total_questions, date, details_json) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (username, course_name, int(score), int(total), date, json.dumps(details))
+                    for username, score, total, details in results
+                ),
+            )
+    finally:
+        conn.close()
+
+def _open_bundle(path: str, mode: str):
+    """Ouvre un bundle JSONL en texte, compressé selon l'extension (.gz, .zst) ou non."""
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("Compression zstd indisponible (zstandard non installé).")
+        if mode == "w":
+            raw = zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+        else:
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def export_exams(path: str, with_charts: bool = False) -> int:
+    """
+    Exporte tous les examens publics, un objet JSON par ligne, sans tout charger en mémoire.
+    Avec `with_charts`, les graphiques sont pré-rendus en PNG (base64) dans `charts`,
+    indexés par numéro de question.
+    """
+    conn = sqlite3.connect('quiz_database.db')
+    count = 0
+    try:
+        with _open_bundle(path, "w") as out:
+            rows = conn.execute(
+                "SELECT author, title, questions_json, created_at, content_hash FROM public_exams ORDER BY id"
+            )
+            for author, title, questions_json, created_at, content_hash in rows:
+                try:
+                    questions = json.loads(questions_json)
+                except (TypeError, ValueError):
+                    continue
+                record = {
+                    "author": author,
+                    "title": title,
+                    "created_at": created_at,
+                    "content_hash": content_hash,
+                    "questions": questions,
+                }
+                if with_charts:
+                    charts = {}
+                    for j, q in enumerate(questions):
+                        png = render_graph_png(q.get('graph_data'))
+                        if png:
+                            charts[str(j)] = png
+                    record["charts"] = charts
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+    finally:
+        conn.close()
+    return count
+
+def _validate_questions(questions):
+    """Lève ValueError si `questions` n'est pas une liste de questions exploitable par l'examen."""
+    if not isinstance(questions, list) or not questions:
+        raise ValueError("`questions` doit être une liste non vide")
+    for j, q in enumerate(questions):
+        if not isinstance(q, dict):
+            raise ValueError(f"question {j + 1} : objet attendu")
+        if not isinstance(q.get("question"), str):
+            raise ValueError(f"question {j + 1} : champ `question` manquant")
+        if not isinstance(q.get("options"), dict) or not q["options"]:
+            raise ValueError(f"question {j + 1} : champ `options` manquant")
+        if q.get("correct_answer") not in q["options"]:
+            raise ValueError(f"question {j + 1} : `correct_answer` absent des options")
+
+def import_exams(path: str, batch_size: int = 1000):
+    """
+    Importe un bundle produit par `export_exams`, par lots transactionnels.
+    Les examens dont le contenu existe déjà (même empreinte) sont ignorés.
+    Les lignes invalides sont ignorées et signalées avec leur numéro, sans interrompre l'import.
+    Les graphiques pré-rendus ne sont pas stockés : ils sont recalculés à partir de `graph_data`.
+
+    Retourne (importés, doublons, erreurs) où erreurs est une liste de (numéro_de_ligne, message).
+    """
+    conn = sqlite3.connect('quiz_database.db')
+    inserted = 0
+    total = 0
+    errors = []
+
+    def flush(batch):
+        with conn:
+            cur = conn.executemany(
+                "INSERT INTO public_exams (author, title, questions_json, created_at, content_hash) "
+                "SELECT ?, ?, ?, ?, ? "
+                "WHERE NOT EXISTS (SELECT 1 FROM public_exams WHERE content_hash = ?)",
+                batch,
+            )
+        return cur.rowcount
+
+    try:
+        with _open_bundle(path, "r") as src:
+            batch = []
+            for line_no, line in enumerate(src, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError("objet JSON attendu")
+                    questions = record.get("questions")
+                    _validate_questions(questions)
+                    for field in ("author", "title", "created_at"):
+                        if not isinstance(record.get(field), (str, type(None))):
+                            raise ValueError(f"champ `{field}` : texte attendu")
+                except ValueError as e:
+                    errors.append((line_no, str(e)))
+                    continue
+                content_hash = exam_content_hash(questions)
+                batch.append((
+                    record.get("author"),
+                    record.get("title") or f"Examen importé de {record.get('author') or 'inconnu'}",
+                    json.dumps(questions),
+                    record.get("created_at") or str(datetime.now())[:16],
+                    content_hash,
+                    content_hash,
+                ))
+                total += 1
+                if len(batch) >= batch_size:
+                    inserted += flush(batch)
+                    batch = []
+            if batch:
+                inserted += flush(batch)
+    finally:
+        conn.close()
+    return inserted, total - inserted, errors
+
 init_db()
 
 # --- 3. UTILITAIRES ---
@@ -154,11 +344,9 @@ def extract_text_from_file(uploaded_file) -> str:
     elif filename.endswith(".pdf"):
         try:
             reader = PdfReader(BytesIO(data))
-            text = ""
-            for page in reader.pages:
-                page_text = page.extract_text() or ""
-                text += page_text + "\n"
-            return text
+            # Les pages sont séparées par un saut de page (\f) pour que
+            # compact_course_text puisse repérer les en-têtes/pieds répétés.
+            return "\f".join(page.extract_text() or "" for page in reader.pages)
         except Exception as e:
             st.warning(f"Impossible de lire le PDF : {e}")
             return ""
@@ -176,12 +364,15 @@ def extract_text_from_file(uploaded_file) -> str:
     elif filename.endswith(".pptx"):
         try:
             prs = Presentation(BytesIO(data))
-            texts = []
+            slides = []
             for slide in prs.slides:
+                texts = []
                 for shape in slide.shapes:
                     if hasattr(shape, "text"):
                         texts.append(shape.text)
-            return "\n".join(texts)
+                slides.append("\n".join(texts))
+            # Une diapositive = une "page" (séparateur \f), comme pour les PDF.
+            return "\f".join(slides)
         except Exception as e:
             st.warning(f"Impossible de lire le PowerPoint : {e}")
             return ""
@@ -216,25 +407,248 @@ def extract_text_from_url(url: str) -> str:
         return ""
     return ""
 
-def render_graph(data):
+PROMPT_TEXT_LIMIT = 25000
+HEADER_FOOTER_LINES = 3
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimation locale (sans appel API) du nombre de tokens :
+    ~4 caractères par token, ce qui est proche de Gemini et GPT pour du texte latin.
+    """
+    if not text:
+        return 0
+    return (len(text) + 3) // 4
+
+_PAGE_NUMBER_RE = re.compile(
+    r"[-–—\s]*((page|p\.|slide|diapo(sitive)?)\s*)?\d+(\s*(/|sur|of)\s*\d+)?[-–—\s]*",
+    re.IGNORECASE,
+)
+
+def _is_page_number(line: str) -> bool:
+    # "3", "- 3 -", "Page 3 / 20", "Diapositive 4 sur 12"...
+    return bool(_PAGE_NUMBER_RE.fullmatch(line))
+
+def _line_signature(line: str) -> str:
+    # Comparaison exacte, sauf pour les numéros de page où les chiffres sont masqués.
+    if _is_page_number(line):
+        return re.sub(r"\d+", "#", line.lower())
+    return line.lower()
+
+def _is_low_information(line: str) -> bool:
+    # Puces isolées, ponctuation seule... Les numéros de page sont traités comme des en-têtes/pieds répétés.
+    return not any(ch.isalnum() for ch in line)
+
+def _is_edge(line: str, pos: int, n_lines: int) -> bool:
+    """
+    Une ligne est candidate en-tête/pied si elle est en haut ou en bas de sa page :
+    - numéros de page : uniquement la première ou la dernière ligne ;
+    - pages courtes (diapositives) : la première ou la dernière ligne ;
+    - sinon : les HEADER_FOOTER_LINES premières ou dernières lignes.
+    """
+    if pos == 0 or pos == n_lines - 1:
+        return True
+    if _is_page_number(line) or n_lines <= 2 * HEADER_FOOTER_LINES:
+        return False
+    return pos < HEADER_FOOTER_LINES or pos >= n_lines - HEADER_FOOTER_LINES
+
+def compact_course_text(text: str):
+    """
+    Nettoie le texte extrait avant de l'envoyer au modèle :
+    - supprime les lignes répétées en haut/bas d'au moins la moitié des pages
+      (en-têtes, pieds de page, titre du cours, numéros de page) ;
+    - supprime les fragments sans lettre ni chiffre (puces vides...) ;
+    - fusionne les espaces et les lignes dupliquées consécutives.
+
+    Retourne (texte_compacté, stats) où stats contient les tailles avant/après
+    en caractères et en tokens estimés.
+    """
+    text = text or ""
+    pages = [
+        [" ".join(l.split()) for l in page.splitlines()]
+        for page in text.split("\f")
+    ]
+    pages = [[l for l in page if l] for page in pages]
+
+    # 1) Lignes présentes en haut/bas d'au moins la moitié des pages (min. 3 pages).
+    # Comparaison exacte, sauf les numéros de page ("Page 3 / 20") dont les chiffres sont masqués.
+    repeated = set()
+    if len(pages) >= 3:
+        page_counts = Counter()
+        for lines in pages:
+            page_counts.update({
+                _line_signature(line)
+                for pos, line in enumerate(lines)
+                if _is_edge(line, pos, len(lines))
+            })
+        threshold = max(3, (len(pages) + 1) // 2)
+        repeated = {sig for sig, n in page_counts.items() if n >= threshold}
+
+    # 2) Filtrage ligne par ligne
+    kept = []
+    for lines in pages:
+        for pos, line in enumerate(lines):
+            if _is_low_information(line):
+                continue
+            if _is_edge(line, pos, len(lines)) and _line_signature(line) in repeated:
+                continue
+            if kept and kept[-1] == line:
+                continue
+            kept.append(line)
+
+    compacted = "\n".join(kept)
+    stats = {
+        "chars_before": len(text),
+        "chars_after": len(compacted),
+        "tokens_before": estimate_tokens(text),
+        "tokens_after": estimate_tokens(compacted),
+    }
+    return compacted, stats
+
+def read_answer_sheets(uploaded_file) -> pd.DataFrame:
+    """
+    Lit un fichier de copies (.csv ou .parquet) :
+    une ligne par étudiant, une colonne d'identifiant puis une colonne par question, dans l'ordre.
+    """
+    if uploaded_file is None:
+        return pd.DataFrame()
+
+    filename = uploaded_file.name.lower()
+    try:
+        if filename.endswith(".parquet"):
+            return pd.read_parquet(BytesIO(uploaded_file.getvalue()))
+        return pd.read_csv(BytesIO(uploaded_file.getvalue()), dtype=str, sep=None, engine="python")
+    except ImportError:
+        st.warning("Lecture Parquet indisponible (pyarrow non installé sur ce serveur).")
+    except Exception as e:
+        st.warning(f"Impossible de lire le fichier de copies : {e}")
+    return pd.DataFrame()
+
+def grade_answer_sheets(questions, sheets: pd.DataFrame):
+    """
+    Corrige toutes les copies d'un coup (opérations NumPy vectorisées).
+
+    - L'identifiant de l'étudiant est la colonne `username` si elle existe, sinon la première colonne.
+    - Les autres colonnes sont les réponses (A, B, C, D), exactement une par question, dans l'ordre.
+    - Les lignes sans identifiant sont ignorées.
+
+    Retourne (resultats, stats_items) :
+    - resultats : DataFrame username / score / total / details (même format que l'examen en ligne) ;
+    - stats_items : difficulté (taux de réussite), discrimination (corrélation
+      point-bisériale avec le score sur les autres questions) et fréquence de chaque option.
+    """
+    n_items = len(questions)
+    id_col = "username" if "username" in sheets.columns else sheets.columns[0]
+    answer_cols = [c for c in sheets.columns if c != id_col]
+    if len(answer_cols) != n_items:
+        raise ValueError(
+            f"Le fichier contient {len(answer_cols)} colonnes de réponses, l'examen a {n_items} questions."
+        )
+
+    # astype(object) avant fillna : les colonnes catégorielles (Parquet) refusent fillna("")
+    ids = sheets[id_col].astype(object).fillna("").astype(str).str.strip()
+    sheets = sheets[ids != ""]
+    if sheets.empty:
+        raise ValueError("Aucune copie avec un identifiant d'étudiant.")
+    usernames = ids[ids != ""].to_numpy()
+    answers = (
+        sheets[answer_cols]
+        .astype(object)
+        .fillna("")
+        .astype(str)
+        .apply(lambda col: col.str.strip().str.upper())
+        .to_numpy(dtype=object)
+    )
+    key = np.array([str(q.get('correct_answer', '')).strip().upper() for q in questions], dtype=object)
+
+    correct = answers == key
+    scores = correct.sum(axis=1)
+
+    # Discrimination : corrélation entre la réussite à l'item et le score sur les autres items
+    item = correct.astype(float)
+    rest = scores[:, None] - item
+    item_c = item - item.mean(axis=0)
+    rest_c = rest - rest.mean(axis=0)
+    num = (item_c * rest_c).sum(axis=0)
+    den = np.sqrt((item_c ** 2).sum(axis=0) * (rest_c ** 2).sum(axis=0))
+    discrimination = np.divide(num, den, out=np.full(n_items, np.nan), where=den > 0)
+
+    stats = pd.DataFrame({
+        "question": [q.get('question', '') for q in questions],
+        "bonne_reponse": key,
+        "difficulte": correct.mean(axis=0),
+        "discrimination": discrimination,
+    })
+    letters = sorted({k for q in questions for k in q.get('options', {})})
+    for letter in letters:
+        stats[f"freq_{letter}"] = (answers == letter).mean(axis=0)
+    stats["freq_sans_reponse"] = (answers == "").mean(axis=0)
+    stats.index = [f"Q{j + 1}" for j in range(n_items)]
+
+    details = [
+        {
+            j: {
+                "u": answers[s, j],
+                "c": questions[j].get('correct_answer'),
+                "e": questions[j].get('explanation'),
+                "q": questions[j].get('question'),
+            }
+            for j in range(n_items)
+        }
+        for s in range(len(usernames))
+    ]
+    results = pd.DataFrame({
+        "username": usernames,
+        "score": scores,
+        "total": n_items,
+        "details": details,
+    })
+    return results, stats
+
+def build_graph_figure(data):
     if not data:
-        return
+        return None
+    x = data.get('x')
+    y = data.get('y')
+    if not (isinstance(x, list) and isinstance(y, list) and len(x) == len(y)):
+        return None
+    fig, ax = plt.subplots(figsize=(6, 4))
     try:
-        x = data.get('x')
-        y = data.get('y')
-        if not (isinstance(x, list) and isinstance(y, list) and len(x) == len(y)):
-            return
-        fig, ax = plt.subplots(figsize=(6, 4))
         plt.style.use('dark_background')
         ax.plot(x, y, marker='o', linestyle='-', linewidth=2)
         ax.set_xlabel(data.get('xlabel', 'X'))
         ax.set_ylabel(data.get('ylabel', 'Y'))
         ax.set_title(data.get('title', 'Graphique'))
         ax.grid(True, alpha=0.3)
-        st.pyplot(fig)
+    except Exception:
+        plt.close(fig)
+        raise
+    return fig
+
+def render_graph(data):
+    try:
+        fig = build_graph_figure(data)
+        if fig is not None:
+            st.pyplot(fig)
     except Exception:
         pass
 
+def render_graph_png(data):
+    """Rend le graphique en PNG encodé en base64 (None si pas de graphique valide)."""
+    try:
+        fig = build_graph_figure(data)
+    except Exception:
+        return None
+    if fig is None:
+        return None
+    try:
+        buf = BytesIO()
+        fig.savefig(buf, format="png")
+        return base64.b64encode(buf.getvalue()).decode("ascii")
+    except Exception:
+        return None
+    finally:
+        plt.close(fig)
+
 def parse_quiz_json(raw_text: str):
     """
     Nettoie les blocs ```json ... ``` ou ``` ... ```
@@ -346,7 +760,7 @@ def build_quiz_prompt(topic_text: str, num_questions: int) -> str:
 Tu es un professeur expert qui prépare des QCM pour des étudiants.
 
 Texte ou contenu de référence (tronqué si très long) :
-\"\"\"{topic_text[:25000]}\"\"\"
+\"\"\"{topic_text[:PROMPT_TEXT_LIMIT]}\"\"\"
 
 
 TÂCHE :
@@ -457,11 +871,11 @@ def main():
                         st.error("Identifiant ou mot de passe invalide.")
             with tab_s:
                 nu = st.text_input("Nouvel identifiant")
-                np = st.text_input("Nouveau mot de passe", type="password")
+                new_pw = st.text_input("Nouveau mot de passe", type="password")
                 if st.button("Créer"):
-                    if not nu or not np:
+                    if not nu or not new_pw:
                         st.warning("Merci de remplir les deux champs.")
-                    elif create_user(nu, np):
+                    elif create_user(nu, new_pw):
                         st.success("Compte créé ! Vous pouvez vous connecter.")
                     else:
                         st.error("Cet identifiant est déjà utilisé.")
@@ -539,6 +953,13 @@ def main():
                     url = st.text_input("URL de la ressource")
                     if url:
                         txt = extract_text_from_url(url)
+                if txt:
+                    txt, stats = compact_course_text(txt)
+                    st.caption(
+                        f"Texte compacté : {stats['chars_before']:,} → {stats['chars_after']:,} caractères, "
+                        f"~{stats['tokens_before']:,} → ~{stats['tokens_after']:,} tokens"
+                        + (" (tronqué à l'envoi)" if stats['chars_after'] > PROMPT_TEXT_LIMIT else "")
+                    )
                 nb_q = st.slider("Nombre de questions", 5, 30, 10)
                 st.markdown('</div>', unsafe_allow_html=True)
 
@@ -696,5 +1117,82 @@ def main():
         else:
             st.dataframe(df[['title', 'author', 'created_at']])
 
+            st.divider()
+            st.subheader("📋 Correction de copies hors ligne")
+            st.caption(
+                "Fichier CSV ou Parquet : une colonne d'identifiant (`username` ou la première colonne), "
+                "puis exactement une colonne par question avec la lettre choisie."
+            )
+            exam_id = st.selectbox(
+                "Examen corrigé",
+                df['id'],
+                format_func=lambda x: f"{df.loc[df['id'] == x, 'title'].iloc[0]} (#{x})",
+                key="bulk_exam",
+            )
+            sel = df[df['id'] == exam_id].iloc[0]
+            if sel['author'] != st.session_state.username:
+                st.info("Seul l'auteur de cet examen peut corriger des copies et les enregistrer dans l'historique.")
+            else:
+                sheets_file = st.file_uploader("Copies des étudiants", type=['csv', 'parquet'], key="bulk_sheets")
+                if st.button("✅ Corriger et enregistrer") and sheets_file:
+                    sheets = read_answer_sheets(sheets_file)
+                    if sheets.empty:
+                        st.warning("Aucune copie à corriger.")
+                    else:
+                        try:
+                            results, stats = grade_answer_sheets(json.loads(sel['questions_json']), sheets)
+                        except ValueError as e:
+                            st.error(str(e))
+                        else:
+                            # On n'écrit dans l'historique que pour des comptes existants
+                            known = get_existing_usernames(results['username'])
+                            is_known = results['username'].isin(known)
+                            save_results_bulk(
+                                sel['title'],
+                                results.loc[is_known, ['username', 'score', 'total', 'details']]
+                                .itertuples(index=False, name=None),
+                            )
+                            st.success(f"{int(is_known.sum())} copies corrigées et enregistrées dans l'historique.")
+                            if len(results) < len(sheets):
+                                st.warning(f"{len(sheets) - len(results)} copies sans identifiant ont été ignorées.")
+                            if not is_known.all():
+                                unknown = results.loc[~is_known, 'username']
+                                st.warning(
+                                    f"{len(unknown)} copies corrigées mais non enregistrées (compte inconnu) : "
+                                    + ", ".join(unknown.head(20))
+                                    + (" ..." if len(unknown) > 20 else "")
+                                )
+                            st.metric("Score moyen (%)", f"{100 * results['score'].mean() / results['total'].iloc[0]:.1f} %")
+                            st.dataframe(results[['username', 'score', 'total']])
+                            st.markdown("**Analyse des items**")
+                            st.dataframe(stats)
+
+def run_cli(argv):
+    """
+    python app.py export examens.jsonl.zst [--charts]
+    python app.py import examens.jsonl.zst [--batch-size 1000]
+    """
+    parser = argparse.ArgumentParser(prog="app.py", description="Export / import de la banque d'examens publics.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_exp = sub.add_parser("export", help="Exporte les examens publics en JSONL (.gz / .zst acceptés).")
+    p_exp.add_argument("path")
+    p_exp.add_argument("--charts", action="store_true", help="Inclut les graphiques pré-rendus en PNG.")
+    p_imp = sub.add_parser("import", help="Importe un bundle JSONL en ignorant les doublons.")
+    p_imp.add_argument("path")
+    p_imp.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        count = export_exams(args.path, with_charts=args.charts)
+        print(f"{count} examens exportés vers {args.path}")
+    else:
+        inserted, skipped, errors = import_exams(args.path, batch_size=args.batch_size)
+        for line_no, message in errors:
+            print(f"ligne {line_no} ignorée : {message}", file=sys.stderr)
+        print(f"{inserted} examens importés, {skipped} doublons ignorés, {len(errors)} lignes invalides")
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] in ("export", "import"):
+        run_cli(sys.argv[1:])
+    else:
+        main()